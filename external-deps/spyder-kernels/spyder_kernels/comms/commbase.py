@@ -8,7 +8,9 @@
 Class that handles communications between Spyder kernel and frontend.
 
 Comms transmit data in a list of buffers, and in a json-able dictionnary.
-Here, we only support a buffer list with a single element.
+Here, the first buffer is a pickle stream and the rest are its out-of-band
+buffers, which are only used with pickle protocol 5 if both sides support
+them.
 
 The messages exchanged have the following msg_dict:
 
@@ -19,7 +21,9 @@ The messages exchanged have the following msg_dict:
     }
     ```
 
-The buffer is generated by cloudpickle using `PICKLE_PROTOCOL = 2`.
+The buffer is generated by pickle using the protocol negotiated by both sides
+of the comm. cloudpickle is only used for objects that pickle can't serialize
+by reference (e.g. lambdas or objects defined in `__main__`).
 
 To simplify the usage of messaging, we use a higher level function calling
 mechanism:
@@ -50,7 +54,6 @@ The messages exchanged are:
                 'call_name': The function name (mostly for debugging)
                 }
 """
-import cloudpickle
 import pickle
 import logging
 import sys
@@ -70,6 +73,60 @@ class CommError(RuntimeError):
     pass
 
 
+def _dumps(data, protocol, out_of_band=False):
+    """
+    Serialize data to be sent through the comm.
+
+    The C pickler is much faster than cloudpickle for the usual data (numbers,
+    strings, containers, arrays, etc), so it's tried first. cloudpickle is
+    used if that fails or if the result references `__main__`, because that
+    module is not the same on both sides of the comm.
+
+    If `out_of_band` is True and protocol 5 is used, large contiguous buffers
+    (e.g. the memory of Numpy arrays) are not copied into the pickle stream
+    but returned separately.
+
+    Returns a list of buffers, where the first one is the pickle stream and
+    the rest are its out-of-band buffers.
+    """
+    oob_buffers = []
+
+    def buffer_callback(pickle_buffer):
+        try:
+            oob_buffers.append(pickle_buffer.raw())
+        except BufferError:
+            # Non-contiguous buffers need to be serialized in-band
+            return True
+        return False
+
+    kwargs = {}
+    if out_of_band and protocol >= 5:
+        kwargs['buffer_callback'] = buffer_callback
+
+    try:
+        buffer = pickle.dumps(data, protocol=protocol, **kwargs)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        buffer = None
+
+    if buffer is None or b'__main__' in buffer:
+        # Imported here because it takes time to import and it's not needed
+        # for most data.
+        import cloudpickle
+
+        oob_buffers.clear()
+        buffer = cloudpickle.dumps(data, protocol=protocol, **kwargs)
+
+    return [buffer] + oob_buffers
+
+
+def _loads(buffers):
+    """Deserialize the buffers received through the comm."""
+    # Out-of-band buffers are copied so that the objects rebuilt from them
+    # (e.g. Numpy arrays) are writable.
+    oob_buffers = [bytearray(buffer) for buffer in buffers[1:]]
+    return pickle.loads(buffers[0], buffers=oob_buffers)
+
+
 class CommsErrorWrapper():
     def __init__(self, call_name, call_id):
         self.call_name = call_name
@@ -217,7 +274,8 @@ class CommBase:
             The (JSONable) content of the message
         data: any
             Any object that is serializable by cloudpickle (should be most
-            things). Will arrive as cloudpickled bytes in `.buffers[0]`.
+            things). Will arrive as pickled bytes in `.buffers[0]`, followed
+            by its out-of-band buffers, if any.
         comm_id: int
             the comm to send to. If None sends to all comms.
         """
@@ -231,8 +289,11 @@ class CommBase:
                 'pickle_protocol': self._comms[comm_id]['pickle_protocol'],
                 'python_version': sys.version,
                 }
-            buffers = [cloudpickle.dumps(
-                data, protocol=self._comms[comm_id]['pickle_protocol'])]
+            buffers = _dumps(
+                data,
+                protocol=self._comms[comm_id]['pickle_protocol'],
+                out_of_band=self._comms[comm_id]['pickle_out_of_band']
+            )
             self._comms[comm_id]['comm'].send(msg_dict, buffers=buffers)
 
     def _set_pickle_protocol(self, protocol):
@@ -240,6 +301,10 @@ class CommBase:
         protocol = min(protocol, pickle.HIGHEST_PROTOCOL)
         self._comms[self.calling_comm_id]['pickle_protocol'] = protocol
 
+    def _set_pickle_out_of_band(self, out_of_band):
+        """Set whether the other side can load out-of-band buffers."""
+        self._comms[self.calling_comm_id]['pickle_out_of_band'] = out_of_band
+
     @property
     def _comm_name(self):
         """
@@ -276,6 +341,7 @@ class CommBase:
         self._comms[comm.comm_id] = {
             'comm': comm,
             'pickle_protocol': DEFAULT_PICKLE_PROTOCOL,
+            'pickle_out_of_band': False,
             'status': 'opening',
             }
 
@@ -293,12 +359,14 @@ class CommBase:
         # Get message dict
         msg_dict = msg['content']['data']
 
-        # Load the buffer. Only one is supported.
+        # Load the buffers.
+        # Note: cloudpickle generates regular pickle streams, so there's no
+        # need to use it here.
         try:
-            buffer = cloudpickle.loads(msg['buffers'][0])
+            buffer = _loads(msg['buffers'])
         except Exception as e:
             logger.debug(
-                "Exception in cloudpickle.loads : %s" % str(e))
+                "Exception in pickle.loads : %s" % str(e))
             buffer = CommsErrorWrapper(
                 msg_dict['content']['call_name'],
                 msg_dict['content']['call_id'])
@@ -379,12 +447,15 @@ class CommBase:
     def on_outgoing_call(self, call_dict):
         """A message is about to be sent"""
         call_dict["pickle_highest_protocol"] = pickle.HIGHEST_PROTOCOL
+        call_dict["pickle_out_of_band"] = True
         return call_dict
 
     def on_incoming_call(self, call_dict):
         """A call was received"""
         if "pickle_highest_protocol" in call_dict:
             self._set_pickle_protocol(call_dict["pickle_highest_protocol"])
+        if "pickle_out_of_band" in call_dict:
+            self._set_pickle_out_of_band(call_dict["pickle_out_of_band"])
 
     def _send_call(self, call_dict, call_data, comm_id):
         """Send call."""
@@ -103,6 +103,13 @@ class FrontendComm(CommBase):
             timeout=timeout,
             display_error=display_error)
 
+    def on_outgoing_call(self, call_dict):
+        """A message is about to be sent"""
+        call_dict = super().on_outgoing_call(call_dict)
+        # Let the frontend know it can batch operations on variables
+        call_dict["apply_ops"] = True
+        return call_dict
+
     def wait_until(self, condition, timeout=None):
         """Wait until condition is met. Returns False if timeout."""
         if condition():
@@ -178,6 +185,8 @@ class FrontendComm(CommBase):
         self._register_comm(comm)
         self._set_pickle_protocol(
             msg['content']['data']['pickle_highest_protocol'])
+        self._set_pickle_out_of_band(
+            msg['content']['data'].get('pickle_out_of_band', False))
 
         # IOPub might not be connected yet, keep sending messages until a
         # reply is received.
@@ -367,6 +367,31 @@ class SpyderKernel(IPythonKernel):
         ns = self.shell._get_reference_namespace(orig_name)
         ns[new_name] = ns[orig_name]
 
+    @comm_handler
+    def apply_ops(self, ops):
+        """
+        Apply a batch of operations on variables, in order.
+
+        Each operation is a tuple (name, args), where name is either
+        'remove_value' or 'copy_value'. All operations are run even if some
+        of them fail, and the failures are reported together at the end.
+        """
+        handlers = {
+            'remove_value': self.remove_value,
+            'copy_value': self.copy_value,
+        }
+        errors = []
+        for name, args in ops:
+            try:
+                handlers[name](*args)
+            except Exception as error:
+                errors.append(f"{name}{args}: {error!r}")
+
+        if errors:
+            raise RuntimeError(
+                "Some operations on variables failed:\n" + "\n".join(errors)
+            )
+
     @comm_handler
     def load_data(self, filename, ext, overwrite=False):
         """
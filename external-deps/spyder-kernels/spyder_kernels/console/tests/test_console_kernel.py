@@ -408,6 +408,27 @@ def test_copy_value(kernel):
     assert "'array_ndim': None" in var_properties
 
 
+def test_apply_ops(kernel):
+    """Test applying a batch of operations on variables."""
+    asyncio.run(kernel.do_execute('a = 1; c = 2', True))
+
+    # A failing operation doesn't prevent the next ones from running
+    with pytest.raises(RuntimeError, match="remove_value"):
+        kernel.apply_ops([
+            ('copy_value', ('a', 'b')),
+            ('remove_value', ('x',)),
+            ('remove_value', ('a',)),
+            ('copy_value', ('y', 'z')),
+            ('remove_value', ('c',)),
+        ])
+
+    var_properties = kernel.get_var_properties()
+    assert 'a' not in var_properties
+    assert 'c' not in var_properties
+    assert 'z' not in var_properties
+    assert kernel.get_value('b') == 1
+
+
 @pytest.mark.parametrize(
     "load", [(True, "val1 = 0", {"val1": np.array(1)}),
              (False, "val1 = 0", {"val1": 0, "val1_000": np.array(1)})])
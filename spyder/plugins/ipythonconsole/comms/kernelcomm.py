@@ -50,6 +50,17 @@ class KernelComm(CommBase, QObject):
             return False
         return all([self._comms[cid]['status'] == 'ready' for cid in id_list])
 
+    def supports_apply_ops(self, comm_id=None):
+        """
+        Check if the kernel can apply a batch of operations on variables.
+        """
+        id_list = self.get_comm_id_list(comm_id)
+        if len(id_list) == 0:
+            return False
+        return all(
+            [self._comms[cid].get('apply_ops', False) for cid in id_list]
+        )
+
     @contextmanager
     def comm_channel_manager(self, comm_id, queue_message=False):
         """Use control_channel instead of shell_channel."""
@@ -107,7 +118,8 @@ class KernelComm(CommBase, QObject):
             self._register_comm(
                 # Create new comm and send the highest protocol
                 kernel_client.comm_manager.new_comm(self._comm_name, data={
-                    'pickle_highest_protocol': pickle.HIGHEST_PROTOCOL}))
+                    'pickle_highest_protocol': pickle.HIGHEST_PROTOCOL,
+                    'pickle_out_of_band': True}))
         except AttributeError:
             logger.info(
                 "Unable to open comm due to unexistent comm manager: " +
@@ -124,6 +136,11 @@ class KernelComm(CommBase, QObject):
     def on_incoming_call(self, call_dict):
         """A call was received"""
         super().on_incoming_call(call_dict)
+        # Kernels that can batch operations on variables announce it
+        if "apply_ops" in call_dict:
+            self._comms[self.calling_comm_id]['apply_ops'] = (
+                call_dict["apply_ops"]
+            )
         # Just in case the call was not received
         self._comm_ready()
 
@@ -11,6 +11,7 @@ Tests for the console kernel.
 
 # Standard library imports
 import os
+import pickle
 
 # Test imports
 import pytest
@@ -164,6 +165,61 @@ def test_comm_base(comms):
     assert len(received_messages) == 2
 
 
+@pytest.mark.skipif(os.name == 'nt', reason="Hangs on Windows")
+def test_comm_base_cloudpickle_fallback(comms):
+    """Test that objects pickle can't handle are sent with cloudpickle."""
+    commsend, commrecv = comms
+
+    received_messages = []
+
+    def handler(msg_dict, buffer):
+        received_messages.append(buffer)
+
+    commrecv._register_message_handler('test_message', handler)
+
+    # Lambdas can't be pickled by reference
+    commsend._send_message('test_message', data=lambda x: x + 1)
+    assert received_messages[0](1) == 2
+
+    # Regular data doesn't need cloudpickle
+    commsend._send_message('test_message', data={'a': [1, 2, 3]})
+    assert received_messages[1] == {'a': [1, 2, 3]}
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="Hangs on Windows")
+def test_comm_base_out_of_band(comms):
+    """Test that buffers are sent out-of-band with pickle protocol 5."""
+    commsend, commrecv = comms
+
+    for comm in commsend._comms.values():
+        comm['pickle_protocol'] = 5
+        comm['pickle_out_of_band'] = True
+
+    sent_buffers = []
+    received_messages = []
+
+    def handler(msg_dict, buffer):
+        received_messages.append(buffer)
+
+    commrecv._register_message_handler('test_message', handler)
+
+    dummy_comm = list(commsend._comms.values())[0]['comm']
+    send = dummy_comm.send
+
+    def send_and_save(msg_dict, buffers=None):
+        sent_buffers.append(buffers)
+        send(msg_dict, buffers=buffers)
+
+    dummy_comm.send = send_and_save
+
+    data = bytearray(b'spam' * 1000)
+    commsend._send_message('test_message', data=pickle.PickleBuffer(data))
+
+    # The data is sent in its own buffer
+    assert len(sent_buffers[0]) == 2
+    assert received_messages[0] == data
+
+
 @pytest.mark.skipif(os.name == 'nt', reason="Hangs on Windows")
 def test_request(comms):
     """Test if the requests are being replied to."""
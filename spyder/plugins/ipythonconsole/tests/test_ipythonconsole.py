@@ -729,6 +729,46 @@ def test_values_dbg(ipyconsole, qtbot):
     assert "*** NameError: name 'aa' is not defined" in control.toPlainText()
 
 
+@flaky(max_runs=3)
+def test_batched_values(ipyconsole, qtbot, mocker):
+    """
+    Test that operations on variables are sent to the kernel in a single call
+    and before any other one.
+    """
+    shell = ipyconsole.get_current_shellwidget()
+    kernel_comm = shell.kernel_handler.kernel_comm
+
+    with qtbot.waitSignal(shell.executed):
+        shell.execute('aa = 10; bb = 20')
+
+    # The kernel announced it can apply batches of operations
+    assert kernel_comm.supports_apply_ops()
+
+    send_call = mocker.spy(kernel_comm, '_send_call')
+
+    def call_names():
+        return [call[0][0]['call_name'] for call in send_call.call_args_list]
+
+    # Operations in the same event loop iteration are sent together
+    shell.copy_value('aa', 'cc')
+    shell.remove_value('aa')
+    shell.remove_value('bb')
+    assert call_names() == []
+
+    qtbot.waitUntil(lambda: call_names() == ['apply_ops'])
+    qtbot.waitUntil(lambda: shell.get_value('cc') == 10)
+    namespace = shell.call_kernel(blocking=True).get_namespace_view()
+    assert 'aa' not in namespace
+    assert 'bb' not in namespace
+
+    # Pending operations are flushed before the next call
+    send_call.reset_mock()
+    shell.remove_value('cc')
+    namespace = shell.call_kernel(blocking=True).get_namespace_view()
+    assert call_names() == ['apply_ops', 'get_namespace_view']
+    assert 'cc' not in namespace
+
+
 @flaky(max_runs=3)
 @pytest.mark.skipif(sys.platform == "darwin", reason="Hangs on Mac")
 def test_execute_events_dbg(ipyconsole, qtbot):
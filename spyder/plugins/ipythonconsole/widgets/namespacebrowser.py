@@ -15,6 +15,7 @@ from pickle import PicklingError, UnpicklingError
 
 # Third-party imports
 from qtconsole.rich_jupyter_widget import RichJupyterWidget
+from qtpy.QtCore import QTimer
 from spyder_kernels.comms.commbase import CommError
 
 # Local imports
@@ -26,44 +27,70 @@ logger = logging.getLogger(__name__)
 # Max time before giving up when making a blocking call to the kernel
 CALL_KERNEL_TIMEOUT = 30
 
+# Messages shown when a value can't be retrieved from the kernel.
+# They are created on first use so translations are already available.
+_MSG_TEMPLATE = None
+_REASONS = None
+
+
+def _get_error_message(reason):
+    """Get the error message shown when a value can't be retrieved."""
+    global _MSG_TEMPLATE, _REASONS
+
+    if _REASONS is None:
+        _MSG_TEMPLATE = _(
+            "<br><i>%s.</i><br><br><br>"
+            "<b>Note</b>: Please don't report this problem on Github, "
+            "there's nothing to do about it."
+        )
+        _REASONS = {
+            'big': _("The variable is too big to be retrieved"),
+            'not_picklable': _("The variable is not picklable"),
+            'dead': _("The kernel is dead"),
+            'other': _("An unkown error occurred. Check the console because "
+                       "its contents could have been printed there"),
+            'comm': _("The comm channel is not working"),
+        }
+
+    return _MSG_TEMPLATE % _REASONS[reason]
+
 
 class NamepaceBrowserWidget(RichJupyterWidget):
     """
     Widget with the necessary attributes and methods to handle communications
     between the IPython Console and the kernel namespace
     """
+
+    def __init__(self, *args, **kwargs):
+        # Operations on variables waiting to be sent to the kernel
+        self._pending_ops = []  # List of (name, args)
+        super().__init__(*args, **kwargs)
+
     # --- Public API --------------------------------------------------
     def get_value(self, name):
         """Ask kernel for a value"""
-        reason_big = _("The variable is too big to be retrieved")
-        reason_not_picklable = _("The variable is not picklable")
-        reason_dead = _("The kernel is dead")
-        reason_other = _("An unkown error occurred. Check the console because "
-                         "its contents could have been printed there")
-        reason_comm = _("The comm channel is not working")
-        msg = _("<br><i>%s.</i><br><br><br>"
-                "<b>Note</b>: Please don't report this problem on Github, "
-                "there's nothing to do about it.")
         try:
             return self.call_kernel(
                 blocking=True,
                 display_error=True,
                 timeout=CALL_KERNEL_TIMEOUT).get_value(name)
         except TimeoutError:
-            raise ValueError(msg % reason_big)
+            raise ValueError(_get_error_message('big'))
         except (PicklingError, UnpicklingError, TypeError):
-            raise ValueError(msg % reason_not_picklable)
+            raise ValueError(_get_error_message('not_picklable'))
         except RuntimeError:
-            raise ValueError(msg % reason_dead)
+            raise ValueError(_get_error_message('dead'))
         except KeyError:
             raise
         except CommError:
-            raise ValueError(msg % reason_comm)
+            raise ValueError(_get_error_message('comm'))
         except Exception:
-            raise ValueError(msg % reason_other)
+            raise ValueError(_get_error_message('other'))
 
     def set_value(self, name, value):
         """Set value for a variable"""
+        # This is not queued because callers expect serialization errors to
+        # be raised here.
         self.call_kernel(
             interrupt=True,
             blocking=False,
@@ -72,16 +99,46 @@ class NamepaceBrowserWidget(RichJupyterWidget):
 
     def remove_value(self, name):
         """Remove a variable"""
-        self.call_kernel(
-            interrupt=True,
-            blocking=False,
-            display_error=True,
-            ).remove_value(name)
+        self._enqueue_op('remove_value', name)
 
     def copy_value(self, orig_name, new_name):
         """Copy a variable"""
-        self.call_kernel(
-            interrupt=True,
-            blocking=False,
-            display_error=True,
-            ).copy_value(orig_name, new_name)
+        self._enqueue_op('copy_value', orig_name, new_name)
+
+    # --- Private API -------------------------------------------------
+    def _enqueue_op(self, name, *args):
+        """
+        Queue an operation on variables.
+
+        Operations queued during the same event loop iteration are sent to
+        the kernel in a single call.
+        """
+        if not self._pending_ops:
+            QTimer.singleShot(0, self._flush_ops)
+        self._pending_ops.append((name, args))
+
+    def _flush_ops(self):
+        """Send queued operations on variables to the kernel."""
+        if not self._pending_ops:
+            return
+
+        ops, self._pending_ops = self._pending_ops, []
+
+        # Older kernels don't have apply_ops, so operations need to be sent
+        # one by one to them.
+        if self.kernel_handler.kernel_comm.supports_apply_ops():
+            self.call_kernel(
+                interrupt=True,
+                blocking=False,
+                display_error=True,
+                ).apply_ops(ops)
+        else:
+            for name, args in ops:
+                getattr(
+                    self.call_kernel(
+                        interrupt=True,
+                        blocking=False,
+                        display_error=True,
+                    ),
+                    name
+                )(*args)
@@ -346,6 +346,10 @@ class ShellWidget(NamepaceBrowserWidget, HelpWidget, DebuggingWidget,
         display_error: bool
             If an error occurs, should it be printed to the console.
         """
+        # Queued operations on variables need to reach the kernel before
+        # any other call to keep them in order.
+        self._flush_ops()
+
         return self.kernel_handler.kernel_comm.remote_call(
             interrupt=interrupt,
             blocking=blocking,
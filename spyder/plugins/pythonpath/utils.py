@@ -15,19 +15,21 @@ import re
 from spyder.utils.environ import get_user_env
 
 
+# Patterns to detect [site|dist]-packages folders
+if os.name == 'nt':
+    SITE_PACKAGES_PATTERN = re.compile(r'.*(l|L)ib/(site|dist)-packages.*')
+else:
+    SITE_PACKAGES_PATTERN = re.compile(
+        r'.*(lib|lib64)/'
+        r'(python|python\d+|python\d+\.\d+)/'
+        r'(site|dist)-packages.*'
+    )
+
+
 def check_path(path):
     """Check that `path` is not a [site|dist]-packages folder."""
-    if os.name == 'nt':
-        pattern = re.compile(r'.*(l|L)ib/(site|dist)-packages.*')
-    else:
-        pattern = re.compile(
-            r'.*(lib|lib64)/'
-            r'(python|python\d+|python\d+\.\d+)/'
-            r'(site|dist)-packages.*'
-        )
-
     path_norm = path.replace('\\', '/')
-    return pattern.match(path_norm) is None
+    return SITE_PACKAGES_PATTERN.match(path_norm) is None
 
 
 def get_system_pythonpath():
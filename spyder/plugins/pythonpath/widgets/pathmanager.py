@@ -7,7 +7,6 @@
 """Spyder path manager."""
 
 # Standard library imports
-from collections import OrderedDict
 import os
 import os.path as osp
 import sys
@@ -15,7 +14,7 @@ import sys
 # Third party imports
 from qtpy import PYQT5, PYQT6
 from qtpy.compat import getexistingdirectory
-from qtpy.QtCore import QSize, Qt, Signal, Slot
+from qtpy.QtCore import QModelIndex, QSize, Qt, Signal, Slot
 from qtpy.QtGui import QFontMetrics
 from qtpy.QtWidgets import (QDialog, QDialogButtonBox, QHBoxLayout,
                             QListWidget, QListWidgetItem, QMessageBox,
@@ -55,6 +54,15 @@ class PathManager(QDialog, SpyderWidgetMixin):
     # This is required for our tests
     CONF_SECTION = 'pythonpath_manager'
 
+    # Font and size hint of headers. They are computed the first time a
+    # header is created.
+    _header_font = None
+    _header_size_hint = None
+
+    # Stylesheet of the dialog. It only depends on constants, so it's
+    # computed the first time it's needed.
+    _cached_stylesheet = None
+
     def __init__(self, parent, path=None, project_path=None,
                  not_active_path=None, sync=True):
         """Path manager dialog."""
@@ -79,6 +87,19 @@ class PathManager(QDialog, SpyderWidgetMixin):
         self.system_path = ()
         self.user_path = []
 
+        # Whether paths could have changed since the last refresh
+        self._dirty = True
+
+        # Results of get_path_dict since paths last changed
+        self._path_dict_cache = {}
+
+        # Map of paths to their items in the list widget
+        self._path_to_item = {}
+
+        # Editable rows, which are updated by _recompute_bounds
+        self._editable_top_row = 0
+        self._editable_bottom_row = 0
+
         # This is necessary to run our tests
         if self.path:
             self.update_paths(system_path=get_system_pythonpath())
@@ -95,6 +116,7 @@ class PathManager(QDialog, SpyderWidgetMixin):
         self.project_header = None
         self.system_header = None
         self.headers = []
+        self._header_ids = set()  # Ids of headers for fast membership tests
         self.selection_widgets = []
         self.right_buttons = self._setup_right_toolbar()
         self.listwidget = QListWidget(self)
@@ -138,8 +160,10 @@ class PathManager(QDialog, SpyderWidgetMixin):
         self.setLayout(layout)
 
         # Signals
-        self.listwidget.currentRowChanged.connect(lambda x: self.refresh())
-        self.listwidget.itemChanged.connect(lambda x: self.refresh())
+        self.listwidget.currentRowChanged.connect(
+            self._on_current_row_changed
+        )
+        self.listwidget.itemChanged.connect(self._on_item_changed)
         self.bbox.accepted.connect(self.accept)
         self.bbox.rejected.connect(self.reject)
 
@@ -159,32 +183,32 @@ class PathManager(QDialog, SpyderWidgetMixin):
             PathManagerToolbuttons.MoveTop,
             text=_("Move path to the top"),
             icon=self.create_icon('2uparrow'),
-            triggered=lambda: self.move_to(absolute=0))
+            triggered=self._move_to_top)
         self.moveup_button = self.create_toolbutton(
             PathManagerToolbuttons.MoveUp,
             tip=_("Move path up"),
             icon=self.create_icon('1uparrow'),
-            triggered=lambda: self.move_to(relative=-1))
+            triggered=self._move_up)
         self.movedown_button = self.create_toolbutton(
             PathManagerToolbuttons.MoveDown,
             tip=_("Move path down"),
             icon=self.create_icon('1downarrow'),
-            triggered=lambda: self.move_to(relative=1))
+            triggered=self._move_down)
         self.movebottom_button = self.create_toolbutton(
             PathManagerToolbuttons.MoveToBottom,
             text=_("Move path to the bottom"),
             icon=self.create_icon('2downarrow'),
-            triggered=lambda: self.move_to(absolute=1))
+            triggered=self._move_to_bottom)
         self.add_button = self.create_toolbutton(
             PathManagerToolbuttons.AddPath,
             tip=_('Add path'),
             icon=self.create_icon('edit_add'),
-            triggered=lambda x: self.add_path())
+            triggered=self._add_path_clicked)
         self.remove_button = self.create_toolbutton(
             PathManagerToolbuttons.RemovePath,
             tip=_('Remove path'),
             icon=self.create_icon('editclear'),
-            triggered=lambda x: self.remove_path())
+            triggered=self._remove_path_clicked)
         self.export_button = self.create_toolbutton(
             PathManagerToolbuttons.ExportPaths,
             icon=self.create_icon('fileexport'),
@@ -198,6 +222,36 @@ class PathManager(QDialog, SpyderWidgetMixin):
             self.selection_widgets + [self.export_button]
         )
 
+    @Slot()
+    def _move_to_top(self):
+        """Move current path to the top."""
+        self.move_to(absolute=0)
+
+    @Slot()
+    def _move_up(self):
+        """Move current path one row up."""
+        self.move_to(relative=-1)
+
+    @Slot()
+    def _move_down(self):
+        """Move current path one row down."""
+        self.move_to(relative=1)
+
+    @Slot()
+    def _move_to_bottom(self):
+        """Move current path to the bottom."""
+        self.move_to(absolute=1)
+
+    @Slot()
+    def _add_path_clicked(self):
+        """Add a path selected by the user."""
+        self.add_path()
+
+    @Slot()
+    def _remove_path_clicked(self):
+        """Remove the current path."""
+        self.remove_path()
+
     def _create_item(self, path):
         """Helper to create a new list item."""
         item = QListWidgetItem(path)
@@ -212,12 +266,14 @@ class PathManager(QDialog, SpyderWidgetMixin):
             item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
             item.setCheckState(Qt.Checked)
 
+        self._path_to_item[path] = item
         return item
 
     def _create_header(self, text):
         """Create a header for a given path section."""
         header_item = QListWidgetItem()
         header_widget = QLabel(text)
+        self._header_ids.add(id(header_item))
 
         # Disable item so we can remove its background color
         header_item.setFlags(header_item.flags() & ~Qt.ItemIsEnabled)
@@ -226,69 +282,41 @@ class PathManager(QDialog, SpyderWidgetMixin):
         header_widget.setAlignment(Qt.AlignHCenter)
 
         # Make header appear in bold
-        font = header_widget.font()
-        font.setBold(True)
-        header_widget.setFont(font)
-
-        # Increase height to make header stand over paths
-        fm = QFontMetrics(font)
-        header_item.setSizeHint(
-            QSize(20, fm.capHeight() + 6 * AppStyle.MarginSize)
-        )
+        cls = type(self)
+        if cls._header_font is None:
+            font = header_widget.font()
+            font.setBold(True)
 
-        return header_item, header_widget
-
-    @property
-    def _stylesheet(self):
-        """Style for the list of paths"""
-        # This is necessary to match the buttons style with the rest of Spyder
-        toolbar_stylesheet = PANES_TOOLBAR_STYLESHEET.get_copy()
-        css = toolbar_stylesheet.get_stylesheet()
+            # Increase height to make header stand over paths
+            fm = QFontMetrics(font)
 
-        css.QListView.setValues(
-            padding=f"{AppStyle.MarginSize + 1}px"
-        )
-
-        css["QListView::item"].setValues(
-            padding=f"{AppStyle.MarginSize + (1 if WIN else 0)}px"
-        )
-
-        css["QListView::item:disabled"].setValues(
-            backgroundColor="transparent"
-        )
-
-        return css.toString()
-
-    # ---- Public methods
-    # -------------------------------------------------------------------------
-    @property
-    def editable_bottom_row(self):
-        """Maximum bottom row count that is editable."""
-        bottom_row = 0
-
-        if self.project_header:
-            bottom_row += len(self.project_path) + 1
-        if self.user_header:
-            bottom_row += len(self.user_path)
+            cls._header_font = font
+            cls._header_size_hint = QSize(
+                20, fm.capHeight() + 6 * AppStyle.MarginSize
+            )
 
-        return bottom_row
+        header_widget.setFont(cls._header_font)
+        header_item.setSizeHint(cls._header_size_hint)
 
-    @property
-    def editable_top_row(self):
-        """Maximum top row count that is editable."""
-        top_row = 0
+        return header_item, header_widget
 
-        if self.project_header:
-            top_row += len(self.project_path) + 1
-        if self.user_header:
-            top_row += 1
+    @Slot(int)
+    def _on_current_row_changed(self, row):
+        """Refresh widgets after the current row changed."""
+        self.refresh()
 
-        return top_row
+    @Slot(QListWidgetItem)
+    def _on_item_changed(self, item):
+        """Refresh widgets after an item was changed (e.g. checked)."""
+        self._set_dirty()
+        self.refresh()
 
-    def setup(self):
-        """Populate list widget."""
+    def _populate_listwidget(self):
+        """Add headers and path items to the list widget."""
         self.listwidget.clear()
         self.headers.clear()
+        self._header_ids.clear()
+        self._path_to_item.clear()
         self.project_header = None
         self.user_header = None
         self.system_header = None
@@ -332,8 +360,139 @@ class PathManager(QDialog, SpyderWidgetMixin):
                 item = self._create_item(path)
                 self.listwidget.addItem(item)
 
-        self.listwidget.setCurrentRow(0)
+    def _recompute_bounds(self):
+        """
+        Compute the editable rows again.
+
+        This needs to be called every time the headers or the number of user
+        paths change.
+        """
+        top_row = 0
+        bottom_row = 0
+
+        if self.project_header:
+            top_row += len(self.project_path) + 1
+            bottom_row += len(self.project_path) + 1
+        if self.user_header:
+            top_row += 1
+            bottom_row += len(self.user_path)
+
+        self._editable_top_row = top_row
+        self._editable_bottom_row = bottom_row
+
+    def _set_dirty(self):
+        """Mark paths as changed, e.g. after adding or checking one."""
+        self._dirty = True
+        self._path_dict_cache = {}
+
+    def _path_dict_changed(self, path_dict):
+        """
+        Check if path_dict is different from the original one.
+
+        Paths order is taken into account, which is not the case when
+        comparing dicts directly.
+        """
+        return (
+            list(self.original_path_dict.items()) != list(path_dict.items())
+        )
+
+    def _compute_path_dict(self, project_path):
+        """Compute the dict returned by get_path_dict."""
+        paths = {}
+
+        # Items before the first header are kept so that none of them is lost
+        in_section = True
+
+        # Walk all items once instead of looking for the row of each header
+        for item in self._get_items():
+            if id(item) in self._header_ids:
+                in_section = project_path or item is not self.project_header
+                continue
+
+            if in_section:
+                path = item.text()
+                if path in self.project_path and not project_path:
+                    continue
+                paths[path] = item.checkState() == Qt.Checked
+
+        return paths
+
+    def _get_items(self):
+        """Get all items of the list widget, in order."""
+        return [
+            self.listwidget.item(row)
+            for row in range(self.listwidget.count())
+        ]
+
+    def _iter_section_items(self, header):
+        """Iterate over the path items of the section that starts at header."""
+        if header is None:
+            return
+
+        start = self.listwidget.row(header)
+        if start < 0:
+            return
+
+        for row in range(start + 1, self.listwidget.count()):
+            item = self.listwidget.item(row)
+            if id(item) in self._header_ids:
+                return
+            yield item
+
+    @property
+    def _stylesheet(self):
+        """Style for the list of paths"""
+        cls = type(self)
+        if cls._cached_stylesheet is not None:
+            return cls._cached_stylesheet
+
+        # This is necessary to match the buttons style with the rest of Spyder
+        toolbar_stylesheet = PANES_TOOLBAR_STYLESHEET.get_copy()
+        css = toolbar_stylesheet.get_stylesheet()
+
+        css.QListView.setValues(
+            padding=f"{AppStyle.MarginSize + 1}px"
+        )
+
+        css["QListView::item"].setValues(
+            padding=f"{AppStyle.MarginSize + (1 if WIN else 0)}px"
+        )
+
+        css["QListView::item:disabled"].setValues(
+            backgroundColor="transparent"
+        )
+
+        cls._cached_stylesheet = css.toString()
+        return cls._cached_stylesheet
+
+    # ---- Public methods
+    # -------------------------------------------------------------------------
+    @property
+    def editable_bottom_row(self):
+        """Maximum bottom row count that is editable."""
+        return self._editable_bottom_row
+
+    @property
+    def editable_top_row(self):
+        """Maximum top row count that is editable."""
+        return self._editable_top_row
+
+    def setup(self):
+        """Populate list widget."""
+        # Freeze the list widget while adding items to it, so it doesn't
+        # relayout, repaint and emit signals after each one of them.
+        self.listwidget.setUpdatesEnabled(False)
+        self.listwidget.blockSignals(True)
+        try:
+            self._populate_listwidget()
+        finally:
+            self.listwidget.blockSignals(False)
+            self.listwidget.setUpdatesEnabled(True)
+
+        self._recompute_bounds()
+        self._set_dirty()
         self.original_path_dict = self.get_path_dict()
+        self.listwidget.setCurrentRow(0)
         self.refresh()
 
     @Slot()
@@ -372,7 +531,9 @@ class PathManager(QDialog, SpyderWidgetMixin):
             if not isinstance(ppath, list):
                 ppath = [ppath]
 
-            ppath = [p for p in ppath if p not in active_path]
+            # Use a set to check membership in constant time
+            active_path_set = set(active_path)
+            ppath = [p for p in ppath if p not in active_path_set]
             ppath = ppath + active_path
 
         os.environ['PYTHONPATH'] = os.pathsep.join(ppath)
@@ -387,33 +548,26 @@ class PathManager(QDialog, SpyderWidgetMixin):
 
     def get_path_dict(self, project_path=False):
         """
-        Return an ordered dict with the path entries as keys and the active
-        state as the value.
+        Return a dict with the path entries as keys and the active state as
+        the value, in the same order as they are displayed.
 
         If `project_path` is True, its entries are also included.
         """
-        odict = OrderedDict()
-        for row in range(self.listwidget.count()):
-            item = self.listwidget.item(row)
-            path = item.text()
-            if item not in self.headers:
-                if path in self.project_path and not project_path:
-                    continue
-                odict[path] = item.checkState() == Qt.Checked
+        project_path = bool(project_path)
+        if project_path not in self._path_dict_cache:
+            self._path_dict_cache[project_path] = (
+                self._compute_path_dict(project_path)
+            )
 
-        return odict
+        # Return a copy so callers can't modify the cached value
+        return dict(self._path_dict_cache[project_path])
 
     def get_user_path(self):
         """Get current user path as displayed on listwidget."""
-        user_path = []
-        for row in range(self.listwidget.count()):
-            item = self.listwidget.item(row)
-            path = item.text()
-            if item not in self.headers:
-                if path not in (self.project_path + self.system_path):
-                    user_path.append(path)
-
-        return user_path
+        return [
+            item.text()
+            for item in self._iter_section_items(self.user_header)
+        ]
 
     def update_paths(self, path=None, not_active_path=None, system_path=None):
         """Update path attributes."""
@@ -439,6 +593,7 @@ class PathManager(QDialog, SpyderWidgetMixin):
 
         # Main variables
         row = self.listwidget.currentRow()
+        is_header = id(current_item) in self._header_ids
         disable_widgets = []
 
         # Move up/top disabled for less than top editable item.
@@ -451,7 +606,7 @@ class PathManager(QDialog, SpyderWidgetMixin):
                                     self.movedown_button])
 
         # Disable almost all buttons on headers or system PYTHONPATH
-        if current_item in self.headers or row > self.editable_bottom_row:
+        if is_header or row > self.editable_bottom_row:
             disable_widgets.extend(
                 [self.movetop_button, self.moveup_button,
                  self.movebottom_button, self.movedown_button]
@@ -462,16 +617,20 @@ class PathManager(QDialog, SpyderWidgetMixin):
 
         # Enable remove button only for user paths
         self.remove_button.setEnabled(
-            not current_item in self.headers
+            not is_header
             and (self.editable_top_row <= row <= self.editable_bottom_row)
         )
 
         self.export_button.setEnabled(self.listwidget.count() > 0)
 
-        # Ok button only enabled if actual changes occur
-        self.button_ok.setEnabled(
-            self.original_path_dict != self.get_path_dict()
-        )
+        # Ok button only enabled if actual changes occur. Paths don't change
+        # when only the current row does, so there's no need to compare them
+        # again in that case.
+        if self._dirty:
+            self.button_ok.setEnabled(
+                self._path_dict_changed(self.get_path_dict())
+            )
+            self._dirty = False
 
     @Slot()
     def add_path(self, directory=None):
@@ -491,8 +650,11 @@ class PathManager(QDialog, SpyderWidgetMixin):
         directory = osp.abspath(directory)
         self.last_path = directory
 
-        if directory in self.get_path_dict():
-            item = self.listwidget.findItems(directory, Qt.MatchExactly)[0]
+        if (
+            directory in self._path_to_item
+            and directory not in self.project_path
+        ):
+            item = self._path_to_item[directory]
             item.setCheckState(Qt.Checked)
             answer = QMessageBox.question(
                 self,
@@ -502,10 +664,16 @@ class PathManager(QDialog, SpyderWidgetMixin):
                   "Do you want to move it to the top of it?"),
                 QMessageBox.Yes | QMessageBox.No)
 
-            if answer == QMessageBox.Yes:
+            # Only user paths can be moved. Other ones (e.g. system paths)
+            # are left where they are.
+            if answer == QMessageBox.Yes and directory in self.user_path:
                 item = self.listwidget.takeItem(self.listwidget.row(item))
-                self.listwidget.insertItem(1, item)
-                self.listwidget.setCurrentRow(1)
+                self.listwidget.insertItem(self.editable_top_row, item)
+                self.listwidget.setCurrentRow(self.editable_top_row)
+
+                # Keep user paths in sync with the list widget
+                self.user_path = self.get_user_path()
+                self._recompute_bounds()
         else:
             if check_path(directory):
                 if not self.user_header:
@@ -513,6 +681,7 @@ class PathManager(QDialog, SpyderWidgetMixin):
                         self._create_header(_("User paths"))
                     )
                     self.headers.append(self.user_header)
+                    self._recompute_bounds()
 
                 # Add header if not visible
                 if self.listwidget.row(self.user_header) < 0:
@@ -531,6 +700,7 @@ class PathManager(QDialog, SpyderWidgetMixin):
                 self.listwidget.setCurrentRow(self.editable_top_row)
 
                 self.user_path.insert(0, directory)
+                self._recompute_bounds()
             else:
                 answer = QMessageBox.warning(
                     self,
@@ -549,6 +719,7 @@ class PathManager(QDialog, SpyderWidgetMixin):
             self.raise_()
             self.setFocus()
 
+        self._set_dirty()
         self.refresh()
 
     @Slot()
@@ -570,6 +741,8 @@ class PathManager(QDialog, SpyderWidgetMixin):
                 # Remove current item from user_path
                 item = self.listwidget.currentItem()
                 self.user_path.remove(item.text())
+                self._path_to_item.pop(item.text(), None)
+                self._recompute_bounds()
 
                 # Remove selected item from view
                 self.listwidget.takeItem(self.listwidget.currentRow())
@@ -580,6 +753,7 @@ class PathManager(QDialog, SpyderWidgetMixin):
                         self.listwidget.row(self.user_header))
 
                 # Refresh widget
+                self._set_dirty()
                 self.refresh()
 
     def move_to(self, absolute=None, relative=None):
@@ -594,11 +768,33 @@ class PathManager(QDialog, SpyderWidgetMixin):
             new_index = index + relative
 
         new_index = max(1, min(self.editable_bottom_row, new_index))
-        item = self.listwidget.takeItem(index)
-        self.listwidget.insertItem(new_index, item)
+
+        # Move the row in the model instead of taking and inserting its item
+        # again. Note: The destination row is counted before the move, so it
+        # needs to be shifted when moving down.
+        self.listwidget.model().moveRow(
+            QModelIndex(),
+            index,
+            QModelIndex(),
+            new_index + (1 if new_index > index else 0)
+        )
         self.listwidget.setCurrentRow(new_index)
 
-        self.user_path = self.get_user_path()
+        # Update user paths in place when the move happened inside their
+        # section, which is always the case when using the toolbar buttons.
+        top_row = self.editable_top_row
+        bottom_row = self.editable_bottom_row
+        if (
+            top_row <= index <= bottom_row
+            and top_row <= new_index <= bottom_row
+        ):
+            path = self.user_path.pop(index - top_row)
+            self.user_path.insert(new_index - top_row, path)
+        else:
+            self.user_path = self.get_user_path()
+            self._recompute_bounds()
+
+        self._set_dirty()
         self.refresh()
 
     def current_row(self):
@@ -637,7 +833,7 @@ class PathManager(QDialog, SpyderWidgetMixin):
     def accept(self):
         """Override Qt method."""
         path_dict = self.get_path_dict()
-        if self.original_path_dict != path_dict:
+        if self._path_dict_changed(path_dict):
             self.sig_path_changed.emit(path_dict)
         super().accept()
 
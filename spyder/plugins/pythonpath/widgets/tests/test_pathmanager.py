@@ -137,6 +137,29 @@ def test_invalid_directories(qtbot, pathmanager):
         pathmanager.add_path(path)
 
 
+@pytest.mark.parametrize('pathmanager',
+                         [((), (), ())],
+                         indirect=True)
+def test_add_repeated_system_path(pathmanager, mocker, tmpdir):
+    """
+    Check that re-adding a system path when there are no user paths leaves it
+    in its section after replying 'yes' to the question.
+    """
+    system_dir = str(tmpdir.mkdir("system"))
+    pathmanager.update_paths(path=(system_dir,), system_path=(system_dir,))
+    pathmanager.setup()
+    assert pathmanager.user_header is None
+
+    mocker.patch.object(pathmanager_mod.QMessageBox, 'question',
+                        return_value=pathmanager_mod.QMessageBox.Yes)
+    pathmanager.add_path(system_dir)
+
+    assert pathmanager.listwidget.item(0) is pathmanager.system_header
+    assert pathmanager.get_user_path() == []
+    assert pathmanager.get_path_dict() == {system_dir: True}
+    assert not pathmanager.button_ok.isEnabled()
+
+
 @pytest.mark.parametrize('pathmanager',
                          [(('/spam', '/bar'), ('/foo', ), ())],
                          indirect=True)
@@ -278,5 +301,29 @@ def test_buttons_state(qtbot, pathmanager, tmpdir):
     assert not pathmanager.button_ok.isEnabled()
 
 
+@pytest.mark.parametrize('pathmanager',
+                         [(('/spam', '/bar', '/ham'), ('/foo', ), ())],
+                         indirect=True)
+def test_move_paths(qtbot, pathmanager):
+    """Check that moving paths keeps the user paths in sync."""
+    pathmanager.show()
+
+    # Move first user path to the bottom
+    pathmanager.set_current_row(3)
+    pathmanager.movebottom_button.animateClick()
+    qtbot.waitUntil(lambda: pathmanager.current_row() == 5)
+    assert pathmanager.user_path == ['/bar', '/ham', '/spam']
+    assert list(pathmanager.get_path_dict())[:3] == pathmanager.user_path
+
+    # Move it up
+    pathmanager.moveup_button.animateClick()
+    qtbot.waitUntil(lambda: pathmanager.current_row() == 4)
+    assert pathmanager.user_path == ['/bar', '/spam', '/ham']
+    assert list(pathmanager.get_path_dict())[:3] == pathmanager.user_path
+
+    # Ok button is enabled because the order changed
+    assert pathmanager.button_ok.isEnabled()
+
+
 if __name__ == "__main__":
     pytest.main([os.path.basename(__file__)])